@@ -1,17 +1,29 @@
 """Agent setup: plan generation + execution with LangChain tools."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
-from typing import Dict, Any, List, Tuple
+import re
+from contextvars import ContextVar
+from queue import Queue
+from threading import Lock, Thread
+from typing import Callable, Dict, Any, Iterator, List, Tuple
 
 import openai
-from langchain.chat_models import ChatOpenAI
+import pandas as pd
+from langchain.callbacks.base import BaseCallbackHandler
 from langchain.agents import (
     AgentType,
     Tool,
     initialize_agent,
 )
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationBufferWindowMemory
+from langchain_community.chat_message_histories import ChatMessageHistory
+from langchain_openai import ChatOpenAI
+from rank_bm25 import BM25Okapi
+
+from session_manager import ChatHistory
 
 # Environment keys should be set by app.py before import
 openai.api_key = os.getenv("OPENAI_API_KEY", "")
@@ -19,19 +31,35 @@ openai.api_key = os.getenv("OPENAI_API_KEY", "")
 # ----------------------------------------------------------------------------
 # 🛠 Brave Search Tool
 # ----------------------------------------------------------------------------
-import requests
+import httpx
 
 BRAVE_API_ENDPOINT = "https://api.search.brave.com/res/v1/web/search"
 BRAVE_API_KEY = os.getenv("BRAVE_API_KEY", "")
+_BRAVE_HEADERS = {
+    "Accept": "application/json",
+    "X-Subscription-Token": BRAVE_API_KEY,
+}
+
+# Shared client keeps TLS connections alive between searches
+_BRAVE_CLIENT = httpx.Client(http2=True, timeout=30, headers=_BRAVE_HEADERS)
 
 def brave_search(query: str, count: int = 5) -> str:
     """Return formatted text of top Brave search results."""
-    headers = {
-        "Accept": "application/json",
-        "X-Subscription-Token": BRAVE_API_KEY,
-    }
     params = {"q": query, "count": count}
-    r = requests.get(BRAVE_API_ENDPOINT, headers=headers, params=params, timeout=30)
+    r = _BRAVE_CLIENT.get(BRAVE_API_ENDPOINT, params=params)
+    return _format_brave_response(r)
+
+
+async def abrave_search(query: str, count: int = 5, client: httpx.AsyncClient | None = None) -> str:
+    """Async variant of :func:`brave_search`; pass ``client`` to share connections."""
+    params = {"q": query, "count": count}
+    if client is not None:
+        return _format_brave_response(await client.get(BRAVE_API_ENDPOINT, params=params))
+    async with httpx.AsyncClient(http2=True, timeout=30, headers=_BRAVE_HEADERS) as client:
+        return _format_brave_response(await client.get(BRAVE_API_ENDPOINT, params=params))
+
+
+def _format_brave_response(r: httpx.Response) -> str:
     if r.status_code != 200:
         return f"(Brave search failed: {r.status_code})"
     data = r.json()
@@ -48,102 +76,499 @@ def brave_search(query: str, count: int = 5) -> str:
 # 🔎 Document search tool (simple keyword search)
 # ----------------------------------------------------------------------------
 
+_TOKEN_RE = re.compile(r"\w+")
+
+# Words too common to make a document relevant on their own
+_STOPWORDS = frozenset(
+    "a about an and are as at be been but by can could did do does for from had has have "
+    "how i if in into is it its me my no not of on or our so than that the their them then "
+    "there these they this those to was we were what when where which who why will with "
+    "would you your".split()
+)
+
+
+def _content_tokens(query_lower: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(query_lower) if t not in _STOPWORDS]
+
+
+def _locate(query_lower: str, query_tokens: List[str], text_lower: str, term_freqs: Dict[str, int]) -> int:
+    """Return the offset of the best match for the query, or -1."""
+    idx = text_lower.find(query_lower)
+    if idx != -1 or not query_tokens:
+        return idx
+    # No exact phrase: anchor on the rarest query word present
+    present = [t for t in query_tokens if t in term_freqs]
+    if present:
+        rarest = min(present, key=term_freqs.__getitem__)
+        m = re.search(rf"\b{re.escape(rarest)}\b", text_lower)
+        return m.start() if m else -1
+    return -1
+
+
+# Shorter words would match inside unrelated words ("in" in "history")
+PARTIAL_MATCH_MIN_LEN = 4
+
+
+def _matching_rows(frame, terms: List[str]):
+    """Rows of a string-cast DataFrame where any cell contains any term."""
+    mask = None
+    for term in terms:
+        hit = frame.apply(
+            lambda col: col.str.contains(term, case=False, regex=False, na=False)
+        ).any(axis=1)
+        mask = hit if mask is None else mask | hit
+    return frame.loc[mask] if mask is not None else frame.iloc[0:0]
+
+
+MAX_SEARCH_HITS = 3
+
+
 def build_document_search(files: Dict[str, Any]):
-    """Return a callable that searches the provided file contents."""
+    """Return a callable that searches the provided file contents.
+
+    Text files and DataFrames are tokenized once into a single BM25 model,
+    so both kinds compete for the ``MAX_SEARCH_HITS`` snippets. Only files
+    containing a non-stopword query word are ranked. When there are none,
+    a substring check for the phrase or longer query words still finds
+    partial words (e.g. "invest" in "investment"). DataFrames are cast to strings once and their
+    matching rows found column-wise with pandas.
+    """
+    files = dict(files)  # snapshot: the caches below must stay in sync with it
+    names: List[str] = list(files)
+    lowered: Dict[str, str] = {}
+    str_frames: Dict[str, Any] = {}
+    corpus: List[List[str]] = []
+    for name, content in files.items():
+        if isinstance(content, str):
+            lowered[name] = content.lower()
+            corpus.append(_TOKEN_RE.findall(lowered[name]))
+        else:
+            str_frames[name] = content.astype(str)
+            # Serialized once here, only to tokenize; queries never re-serialize
+            corpus.append(_TOKEN_RE.findall(content.to_csv(index=False).lower()))
+    # BM25Okapi divides by the average document length, so it needs some text
+    bm25 = BM25Okapi(corpus) if any(corpus) else None
+    # Per-file term frequencies, reused from BM25 rather than kept twice
+    term_freqs: List[Dict[str, int]] = bm25.doc_freqs if bm25 else [{} for _ in names]
+    del corpus
+
     def _search_documents(query: str) -> str:
         query_lower = query.lower()
+        query_tokens = _content_tokens(query_lower)
+        candidates = [
+            i for i in range(len(names))
+            if any(t in term_freqs[i] for t in query_tokens)
+        ]
+        if candidates:
+            scores = bm25.get_scores(query_tokens)
+            candidates.sort(key=lambda i: scores[i], reverse=True)
+            return _format_hits(
+                candidates, [query_lower], query_tokens,
+                lambda i: _locate(query_lower, query_tokens, lowered[names[i]], term_freqs[i]),
+            )
+        # No whole-word hit anywhere: one substring pass over the corpus
+        terms = [query_lower.strip()] + [t for t in query_tokens if len(t) >= PARTIAL_MATCH_MIN_LEN]
+        terms = [t for t in terms if t]
+        return _format_hits(
+            range(len(names)), terms, [],
+            lambda i: next((j for j in (lowered[names[i]].find(t) for t in terms) if j != -1), -1),
+        )
+
+    def _format_hits(
+        ranked, terms: List[str], query_tokens: List[str], locate: Callable[[int], int]
+    ) -> str:
+        """Format up to ``MAX_SEARCH_HITS`` snippets from files in ``ranked`` order."""
         snippets: List[str] = []
-        for name, content in files.items():
-            if isinstance(content, str):
-                if query_lower in content.lower():
-                    idx = content.lower().find(query_lower)
-                    snippet = content[max(0, idx - 120) : idx + 400]
-                    snippets.append(f"From {name}: …{snippet}…")
-            else:
-                # DataFrame: convert to CSV text
-                csv_text = content.to_csv(index=False)
-                if query_lower in csv_text.lower():
-                    snippets.append(f"Query found in DataFrame {name} (omitted for brevity)")
+        for i in ranked:
+            if len(snippets) >= MAX_SEARCH_HITS:
+                break
+            name = names[i]
+            if name in str_frames:
+                frame_terms = terms + [t for t in query_tokens if t in term_freqs[i]]
+                frame = str_frames[name]
+                rows = _matching_rows(frame, frame_terms)
+                if rows.empty:
+                    # The words may only occur in the header
+                    rows = frame[[c for c in frame.columns if any(t in str(c).lower() for t in frame_terms)]]
+                if not rows.empty:
+                    snippets.append(f"From DataFrame {name}:\n{rows.head(3).to_string()}")
+                continue
+            idx = locate(i)
+            if idx == -1:
+                continue
+            snippet = files[name][max(0, idx - 120) : idx + 400]
+            snippets.append(f"From {name}: …{snippet}…")
         return "\n".join(snippets) if snippets else "No match in uploaded documents."
 
     return _search_documents
 
+# ----------------------------------------------------------------------------
+# 🧰 Batch search tool (web + documents concurrently)
+# ----------------------------------------------------------------------------
+
+def batch_search(requests_text: str, search_documents) -> str:
+    """Run several searches concurrently.
+
+    ``requests_text`` holds one search per line, each prefixed with ``web:``
+    or ``documents:``. Lines without a prefix are treated as web searches.
+    """
+    searches: List[Tuple[str, str]] = []
+    for line in requests_text.splitlines():
+        kind, sep, query = line.partition(":")
+        kind = kind.strip().lower()
+        if not sep or kind not in ("web", "documents"):
+            kind, query = "web", line
+        if query.strip():
+            searches.append((kind, query.strip()))
+    if not searches:
+        return "No searches given."
+
+    async def _run_all() -> List[str]:
+        async with httpx.AsyncClient(http2=True, timeout=30, headers=_BRAVE_HEADERS) as client:
+            return await asyncio.gather(*[
+                abrave_search(q, 5, client) if kind == "web" else asyncio.to_thread(search_documents, q)
+                for kind, q in searches
+            ])
+
+    results = asyncio.run(_run_all())
+    return "\n\n".join(
+        f"[{kind}: {q}]\n{res}" for (kind, q), res in zip(searches, results)
+    )
+
 # ----------------------------------------------------------------------------
 # 🧠 Memory & LLM
 # ----------------------------------------------------------------------------
-llm = ChatOpenAI(model_name="gpt-4o", temperature=0)
+llm = ChatOpenAI(model="gpt-4o", temperature=0, streaming=True)
 
 # ----------------------------------------------------------------------------
 # 📑 Plan generation (visible to user)
 # ----------------------------------------------------------------------------
 
-def generate_plan(question: str, files: Dict[str, Any] | None = None) -> List[str]:
+PLAN_INSTRUCTIONS = (
+    "Using numbered steps, outline a concise research plan to answer the user's question. "
+    "Include actions such as web search, reading uploaded documents, summarizing, and analysis."
+)
+
+
+MAX_CACHED_PLANS = 256
+
+# Streamlit serves each browser session on its own thread, so the module-level
+# caches below are shared; all their inserts and evictions go through this lock.
+_cache_lock = Lock()
+
+
+def _bounded_put(cache: Dict[Any, Any], key: Any, value: Any, max_size: int) -> None:
+    """Insert into a FIFO-bounded cache, evicting the oldest entry when full."""
+    with _cache_lock:
+        if key not in cache and len(cache) >= max_size:
+            cache.pop(next(iter(cache)), None)
+        cache[key] = value
+
+_plan_cache: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+
+
+def generate_plan(question: str, files: Dict[str, Any] | None = None) -> Iterator[str]:
+    """Yield the plan text as it is generated; see :func:`parse_plan`.
+
+    Cached plans are yielded in one piece.
+    """
+    # The prompt only mentions file names, so they (not contents) key the cache
+    file_names = tuple(files.keys()) if files else ()
+    cache_key = (question, file_names)
+    cached = _plan_cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
     file_note = (
-        f"The user provided files: {', '.join(files.keys())}. " if files else ""
+        f"The user provided files: {', '.join(file_names)}. " if file_names else ""
     )
-    prompt = (
-        f"{file_note}Using numbered steps, outline a concise research plan to answer: '{question}'. "
-        "Include actions such as web search, reading uploaded documents, summarizing, and analysis."
-    )
-    resp = llm([{"role": "user", "content": prompt}])
-    text = resp.content.strip()
-    steps = [s.strip("- ") for s in text.split("\n") if s.strip()]
-    return steps
+    # Static instructions first, per-request details last: keeps the prompt
+    # prefix identical across calls so OpenAI's prompt cache can hit.
+    chunks: List[str] = []
+    for chunk in llm.stream([
+        {"role": "system", "content": PLAN_INSTRUCTIONS},
+        {"role": "user", "content": f"{file_note}Question: '{question}'"},
+    ]):
+        chunks.append(chunk.content)
+        yield chunk.content
+
+    _bounded_put(_plan_cache, cache_key, "".join(chunks), MAX_CACHED_PLANS)
+
+
+def parse_plan(text: str) -> List[str]:
+    """Split generated plan text into its steps."""
+    return [s.strip("- ") for s in text.strip().split("\n") if s.strip()]
 
 # ----------------------------------------------------------------------------
 # 🤖 Agent execution
 # ----------------------------------------------------------------------------
-_agent_cache: Dict[str, Any] = {}
+# Only the most recent turns are rendered into the prompt, bounding its size
+MEMORY_WINDOW_TURNS = 10
+
+# ZeroShotAgent's default suffix has no chat history; this one renders the
+# memory window after the static tool/format prefix.
+MEMORY_PROMPT_SUFFIX = """Begin!
+
+Previous conversation:
+{chat_history}
+
+Question: {input}
+Thought:{agent_scratchpad}"""
+
+MAX_CACHED_AGENTS = 16
+MAX_CACHED_SEARCHES = 8
+
+_agent_cache: Dict[Tuple[str, str], Any] = {}
+# Search indexes are the expensive part of an agent; sessions with the same
+# files share one instead of each building their own.
+_search_cache: Dict[str, Callable[[str], str]] = {}
 
-def _get_agent(files: Dict[str, Any]):
-    """Return (and cache) a LangChain agent configured with the current files."""
-    cache_key = str(sorted(files.keys()))
-    if cache_key in _agent_cache:
-        return _agent_cache[cache_key]
 
-    # Build document search tool specific to current files
+def files_fingerprint(files: Dict[str, Any]) -> str:
+    """Hash file names and contents, so edits to a same-named file are noticed."""
+    h = hashlib.blake2b(digest_size=16)
+    for name in sorted(files):
+        content = files[name]
+        h.update(name.encode("utf-8"))
+        if isinstance(content, str):
+            h.update(content.encode("utf-8", errors="surrogatepass"))
+        else:
+            h.update(repr(content.shape).encode())
+            h.update(pd.util.hash_pandas_object(content, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+def _get_agent(files: Dict[str, Any], session_id: str, chat_history: ChatHistory | None = None):
+    """Return (and cache) a LangChain agent configured with the current files.
+
+    Agents are keyed by the files' content fingerprint and ``session_id``;
+    at most ``MAX_CACHED_AGENTS`` are kept, oldest evicted first.
+    Conversation memory is held in process with the agent, which appends
+    each turn itself; a new agent (first question, changed files, eviction)
+    is seeded with the last window of ``chat_history``, the app's own record.
+    """
+    fingerprint = files_fingerprint(files)
+    cache_key = (fingerprint, session_id)
+    agent = _agent_cache.get(cache_key)
+    if agent is not None:
+        return agent
+
+    history = ChatMessageHistory()
+    if chat_history:
+        for m in chat_history[-2 * MEMORY_WINDOW_TURNS:]:
+            if m["role"] == "user":
+                history.add_user_message(m["content"])
+            else:
+                history.add_ai_message(m["content"])
+    memory = ConversationBufferWindowMemory(
+        memory_key="chat_history", chat_memory=history, k=MEMORY_WINDOW_TURNS
+    )
+    agent = _build_agent(_get_document_search(files, fingerprint), memory)
+    _bounded_put(_agent_cache, cache_key, agent, MAX_CACHED_AGENTS)
+    return agent
+
+
+def _get_document_search(files: Dict[str, Any], fingerprint: str | None = None) -> Callable[[str], str]:
+    """Return (and cache) the document search for these files, keyed by content."""
+    fingerprint = fingerprint or files_fingerprint(files)
+    search = _search_cache.get(fingerprint)
+    if search is None:
+        search = build_document_search(files)
+        _bounded_put(_search_cache, fingerprint, search, MAX_CACHED_SEARCHES)
+    return search
+
+
+# Tool results for the current run_agent turn; None outside a turn (no caching)
+_turn_call_cache: ContextVar[Dict[Tuple[str, str], str] | None] = ContextVar(
+    "_turn_call_cache", default=None
+)
+
+
+def _dedup_per_turn(kind: str, func: Callable[[str], str]) -> Callable[[str], str]:
+    """Wrap a tool so repeated queries within one turn reuse the first result."""
+    def _call(query: str) -> str:
+        cache = _turn_call_cache.get()
+        if cache is None:
+            return func(query)
+        key = (kind, query.strip().lower())
+        if key not in cache:
+            cache[key] = func(query)
+        return cache[key]
+
+    return _call
+
+
+def _build_agent(
+    search_documents: Callable[[str], str], memory: ConversationBufferWindowMemory | None = None
+):
     doc_search_tool = Tool(
         name="document_search",
-        func=build_document_search(files),
+        func=_dedup_per_turn("documents", search_documents),
         description="Search the user's uploaded documents for relevant passages.",
     )
     web_tool = Tool(
         name="web_search",
-        func=lambda q: brave_search(q, 5),
+        func=_dedup_per_turn("web", lambda q: brave_search(q, 5)),
         description="Search the web (Brave) for up‑to‑date information.",
     )
+    batch_tool = Tool(
+        name="batch_search",
+        func=lambda text: batch_search(text, search_documents),
+        description=(
+            "Run several web and/or document searches at once. Input: one search per line, "
+            "each prefixed with 'web:' or 'documents:'."
+        ),
+    )
 
-    memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-
-    agent = initialize_agent(
-        tools=[web_tool, doc_search_tool],
+    agent_kwargs = {}
+    if memory is not None:
+        agent_kwargs = {
+            "suffix": MEMORY_PROMPT_SUFFIX,
+            "input_variables": ["input", "chat_history", "agent_scratchpad"],
+        }
+    return initialize_agent(
+        tools=[web_tool, doc_search_tool, batch_tool],
         llm=llm,
         agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
         memory=memory,
+        agent_kwargs=agent_kwargs,
         verbose=False,
     )
-    _agent_cache[cache_key] = agent
-    return agent
 
 
-def run_agent(question: str, st_state) -> Tuple[str, List[str]]:
-    """Run the agent on the question. Return (answer_markdown, source_links)."""
-    files = st_state.get("files", {})
-    agent = _get_agent(files)
+def warm_up(files: Dict[str, Any], session_id: str) -> None:
+    """Build and cache the session's agent in the background.
+
+    Its memory store and search index are the cold cost of the first query;
+    the question then finds the agent ready under the same cache key.
+    """
+    Thread(target=_get_agent, args=(files, session_id), daemon=True).start()
+
+
+# ----------------------------------------------------------------------------
+# 📡 Token streaming
+# ----------------------------------------------------------------------------
+FINAL_ANSWER_PREFIX = "Final Answer:"
+_URL_RE = re.compile(r"https?://\S+")
+_STREAM_DONE = object()
 
-    # Preload memory with past chat
-    for m in st_state.get("chat_history", []):
-        role = m["role"]
-        if role == "user":
-            agent.memory.chat_memory.add_user_message(m["content"])
-        else:
-            agent.memory.chat_memory.add_ai_message(m["content"])
 
-    answer: str = agent.run(question)
+class _FinalAnswerStreamHandler(BaseCallbackHandler):
+    """Forward tokens of the agent's final answer into a queue.
 
-    # Rudimentary extraction of URLs from answer for citation list
-    import re
+    ReAct output interleaves thoughts and tool calls; only the text after
+    ``Final Answer:`` in the last LLM call is meant for the user.
+    """
 
-    urls = re.findall(r"https?://\S+", answer)
+    def __init__(self, queue: Queue):
+        self.queue = queue
+        self._buffer = ""
+        self._streaming = False
+        self.emitted = False
+
+    def on_llm_start(self, *args, **kwargs) -> None:
+        self._buffer = ""
+        self._streaming = False
+
+    def on_llm_new_token(self, token: str, **kwargs) -> None:
+        if not self._streaming:
+            self._buffer += token
+            idx = self._buffer.find(FINAL_ANSWER_PREFIX)
+            if idx == -1:
+                return
+            self._streaming = True
+            token = self._buffer[idx + len(FINAL_ANSWER_PREFIX):]
+        if not self.emitted:
+            token = token.lstrip()
+        if token:
+            self.emitted = True
+            self.queue.put(token)
+
+
+def _get_agent_for_state(question: str, st_state):
+    history = st_state.get("chat_history", [])
+    # The current question is usually already appended; the agent saves it itself
+    if history and history[-1]["role"] == "user" and history[-1]["content"] == question:
+        history = history[:-1]
+    return _get_agent(st_state.get("files", {}), st_state.get("memory_id", "default"), history)
+
+
+def run_agent(question: str, st_state) -> Iterator[str]:
+    """Start the agent on the question and return an iterator of answer tokens.
+
+    The agent begins working immediately in a background thread, so callers
+    can do other work (e.g. plan generation) before consuming the iterator.
+    Use :func:`extract_sources` on the accumulated answer for citations.
+    """
+    agent = _get_agent_for_state(question, st_state)
+
+    tokens: Queue = Queue()
+    handler = _FinalAnswerStreamHandler(tokens)
+    result: Dict[str, Any] = {}
+
+    def _worker() -> None:
+        try:
+            result["answer"] = _run_turn(agent, question, [handler])
+        except Exception as exc:  # re-raised in the consuming thread
+            result["error"] = exc
+        finally:
+            tokens.put(_STREAM_DONE)
+
+    Thread(target=_worker, daemon=True).start()
+    return _drain_tokens(tokens, handler, result)
+
+
+async def run_agent_async(question: str, st_state) -> Tuple[str, List[str]]:
+    """Run the agent on the question without streaming. Return (answer, sources)."""
+    agent = _get_agent_for_state(question, st_state)
+    # The SQLite-backed memory is sync-only, so the turn runs in a thread
+    answer = await asyncio.to_thread(_run_turn, agent, question, [])
+    return answer, extract_sources(answer)
+
+
+def _run_turn(agent, question: str, callbacks: List[BaseCallbackHandler]) -> str:
+    _turn_call_cache.set({})  # fresh tool-call cache for this turn
+    result = agent.invoke({"input": question}, config={"callbacks": callbacks})
+    return result["output"]
+
+
+def _drain_tokens(
+    tokens: Queue, handler: _FinalAnswerStreamHandler, result: Dict[str, Any]
+) -> Iterator[str]:
+    while (token := tokens.get()) is not _STREAM_DONE:
+        yield token
+
+    if "error" in result:
+        raise result["error"]
+    if not handler.emitted:
+        # Agent finished without a streamable final answer (e.g. early stop)
+        yield result.get("answer", "")
+
+
+def extract_sources(answer: str) -> List[str]:
+    """Rudimentary extraction of URLs from answer for citation list."""
+    urls = _URL_RE.findall(answer)
     unique_urls: List[str] = sorted(set(urls))[:5]  # cap at 5
-    return answer, unique_urls
+    return unique_urls
+
+
+# ----------------------------------------------------------------------------
+# 📦 Batch execution (evaluation / multi-question turns)
+# ----------------------------------------------------------------------------
+
+async def arun_agent_batch(questions: List[str], st_state) -> List[Tuple[str, List[str]]]:
+    """Answer independent questions concurrently. Return [(answer, sources)].
+
+    The batch agent has no memory, so questions neither see the chat history
+    nor each other and can safely share one executor.
+    """
+    agent = _build_agent(_get_document_search(st_state.get("files", {})))
+    results = await asyncio.gather(*[agent.ainvoke({"input": q}) for q in questions])
+    answers = [r["output"] for r in results]
+    return [(answer, extract_sources(answer)) for answer in answers]
+
+
+def run_agent_batch(questions: List[str], st_state) -> List[Tuple[str, List[str]]]:
+    """Synchronous wrapper around :func:`arun_agent_batch`."""
+    return asyncio.run(arun_agent_batch(questions, st_state))
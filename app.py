@@ -5,14 +5,15 @@ web search via Brave API, and session persistence to deliver a deep‑research c
 from __future__ import annotations
 
 import os
+import uuid
 from datetime import datetime
 from typing import Dict, List, Any
 
 import streamlit as st
 
-from session_manager import list_sessions, load_session, save_session
+from session_manager import autosave_session, list_sessions, load_session, save_session
 from file_utils import load_files
-from agent_engine import generate_plan, run_agent
+from agent_engine import extract_sources, files_fingerprint, generate_plan, parse_plan, run_agent, warm_up
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔧 Configuration & Secrets
@@ -43,6 +44,13 @@ if "files" not in st.session_state:
     st.session_state.files: Dict[str, Any] = {}
 if "current_session" not in st.session_state:
     st.session_state.current_session: str | None = None
+if "memory_id" not in st.session_state:
+    # Keys the agent's conversation memory; one per tab so tabs never share it
+    st.session_state.memory_id: str = uuid.uuid4().hex
+if "warmed" not in st.session_state:
+    # Have this tab's agent ready before the first question
+    warm_up(dict(st.session_state.files), st.session_state.memory_id)
+    st.session_state.warmed = True
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📁 Sidebar – session management & file upload
@@ -50,7 +58,9 @@ if "current_session" not in st.session_state:
 with st.sidebar:
     st.header("Session")
     sessions = list_sessions()
-    default_idx = 0 if st.session_state.current_session is None else sessions.index(st.session_state.current_session) + 1
+    current = st.session_state.current_session
+    # A failed save can leave the current session missing from disk
+    default_idx = sessions.index(current) + 1 if current in sessions else 0
     session_option = st.selectbox(
         "Load existing session or create new:",
         options=["(New Session)"] + sessions,
@@ -62,6 +72,8 @@ with st.sidebar:
         st.session_state.chat_history = chat
         st.session_state.files = files
         st.session_state.current_session = session_option
+        # Fresh memory per tab, seeded from the loaded chat on the first question
+        st.session_state.memory_id = uuid.uuid4().hex
         st.success(f"Loaded session: {session_option}")
 
     if st.button("💾 Save Session"):
@@ -95,15 +107,21 @@ if prompt:
     st.chat_message("🧑‍💻 User").write(prompt)
     st.session_state.chat_history.append({"role": "user", "content": prompt})
 
-    # 2️⃣  Generate & show plan
-    plan_steps = generate_plan(prompt, st.session_state.files)
+    # 2️⃣  Start the agent, then stream the plan while the agent works
+    answer_stream = run_agent(prompt, st.session_state)
+    plan_box = st.chat_message("📑 Plan").empty()
+    plan_text = ""
+    for token in generate_plan(prompt, st.session_state.files):
+        plan_text += token
+        plan_box.markdown(plan_text)
+    plan_steps = parse_plan(plan_text)
     plan_md = "\n".join(f"{i+1}. {step}" for i, step in enumerate(plan_steps))
-    st.chat_message("📑 Plan").markdown(plan_md)
+    plan_box.markdown(plan_md)
 
-    # 3️⃣  Run agent & display answer
+    # 3️⃣  Stream agent answer
     with st.chat_message("🤖 Assistant"):
-        answer, sources = run_agent(prompt, st.session_state)
-        st.markdown(answer)
+        answer = st.write_stream(answer_stream)
+        sources = extract_sources(answer)
         if sources:
             st.markdown("**Sources:**")
             for link in sources:
@@ -112,6 +130,11 @@ if prompt:
     # 4️⃣  Store assistant response
     st.session_state.chat_history.append({"role": "assistant", "content": answer})
 
-    # 5️⃣  Auto‑save session
+    # 5️⃣  Auto‑save session (appends just this turn when the log on disk allows)
     autosave = st.session_state.current_session or "autosave_latest"
-    save_session(autosave, st.session_state.chat_history, st.session_state.files)
+    autosave_session(
+        autosave,
+        st.session_state.chat_history,
+        st.session_state.files,
+        files_fingerprint(st.session_state.files),
+    )
@@ -2,44 +2,100 @@
 from __future__ import annotations
 
 import io
-from typing import Dict, Any
+import multiprocessing
+import os
+from threading import Lock
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Tuple
 
+import fitz  # PyMuPDF
 import pandas as pd
-from PyPDF2 import PdfReader
+import streamlit as st
 from docx import Document
 
+from pdf_worker import extract_page_range
+
 # -----------------------------------------------------------------------------
 # 🔍 File loaders
 # -----------------------------------------------------------------------------
 
+MAX_LOAD_WORKERS = 8
+
+
 def load_files(uploaded_files) -> Dict[str, Any]:
     """Return a mapping {filename: content} for a list of Streamlit UploadedFile."""
-    content = {}
-    for f in uploaded_files:
-        name = f.name
-        if name.lower().endswith(".pdf"):
-            text = _read_pdf(f)
-            content[name] = text
-        elif name.lower().endswith(".docx"):
-            text = _read_docx(f)
-            content[name] = text
-        elif name.lower().endswith(".csv"):
-            df = pd.read_csv(f)
-            content[name] = df
-        else:
-            # Assume plain text
-            data = f.getvalue().decode("utf-8", errors="ignore")
-            content[name] = data
-    return content
-
-
-def _read_pdf(uploaded_file) -> str:
-    reader = PdfReader(uploaded_file)
-    pages = [page.extract_text() or "" for page in reader.pages]
-    return "\n".join(pages)
-
-
-def _read_docx(uploaded_file) -> str:
-    doc = Document(uploaded_file)
+    if not uploaded_files:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(uploaded_files))) as pool:
+        results = list(pool.map(_load_one, uploaded_files))
+    return dict(results)
+
+
+def _load_one(f) -> Tuple[str, Any]:
+    return f.name, _parse_one(f.name, f.getvalue())
+
+
+# Streamlit reruns the script on every interaction; caching on the raw bytes
+# means unchanged uploads are not parsed again.
+@st.cache_data(show_spinner=False)
+def _parse_one(name: str, data: bytes) -> Any:
+    if name.lower().endswith(".pdf"):
+        return _read_pdf(data)
+    elif name.lower().endswith(".docx"):
+        return _read_docx(data)
+    elif name.lower().endswith(".csv"):
+        return pd.read_csv(io.BytesIO(data))
+    else:
+        # Assume plain text
+        return data.decode("utf-8", errors="ignore")
+
+
+# PDFs shorter than this are extracted in-process. PyMuPDF takes ~1.5 ms per
+# text page, so 256 pages is ~0.4 s of work; below that the ~0.15 s to spawn a
+# worker on first use, plus shipping the PDF bytes to each one, eats the gain.
+PARALLEL_PDF_MIN_PAGES = 256
+
+
+# PyMuPDF does not support multithreaded use, and load_files parses files on a
+# thread pool, so every in-process fitz call goes through this lock.
+_FITZ_LOCK = Lock()
+
+
+def _read_pdf(data: bytes) -> str:
+    with _FITZ_LOCK, fitz.open(stream=data, filetype="pdf") as doc:
+        n_pages = doc.page_count
+        workers = min(os.cpu_count() or 1, n_pages)
+        if n_pages < PARALLEL_PDF_MIN_PAGES or workers < 2:
+            return "\n".join(page.get_text() for page in doc)
+
+    # One contiguous page range per worker, so each process parses the PDF once
+    step = -(-n_pages // workers)
+    ranges = [(data, start, min(start + step, n_pages)) for start in range(0, n_pages, step)]
+    chunks = list(_pdf_pool().map(extract_page_range, ranges))
+    return "\n".join(text for chunk in chunks for text in chunk)
+
+
+_PDF_POOL: ProcessPoolExecutor | None = None
+_PDF_POOL_LOCK = Lock()
+
+
+def _pdf_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all PDF loads, capping the total at one per CPU.
+
+    Workers are spawned rather than forked: forking the multi-threaded
+    Streamlit server can deadlock the child on locks held by other threads.
+    """
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            _PDF_POOL = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _PDF_POOL
+
+
+def _read_docx(data: bytes) -> str:
+    doc = Document(io.BytesIO(data))
     paras = [p.text for p in doc.paragraphs]
     return "\n".join(paras)
@@ -0,0 +1,18 @@
+"""PDF page extraction run in worker processes.
+
+Spawned workers import this module on start-up, so it imports PyMuPDF only;
+pulling in file_utils would load Streamlit, pandas and python-docx in every
+worker.
+"""
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import fitz  # PyMuPDF
+
+
+def extract_page_range(args: Tuple[bytes, int, int]) -> List[str]:
+    """Return the text of pages ``start`` to ``stop`` (exclusive) of a PDF."""
+    data, start, stop = args
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
@@ -1,10 +1,28 @@
-"""Simple JSON file–based persistence for chat sessions."""
+"""Simple JSON file–based persistence for chat sessions.
+
+Layout: ``saved_sessions/<name>/chat.jsonl`` is an append-only log of chat
+messages, ``saved_sessions/<name>/chat.json`` maps file name → blob, and
+``saved_sessions/<name>/files/`` is a content-addressed store of file bodies
+(``<hash>.txt`` / ``<hash>.parquet``, or ``<hash>.csv`` for DataFrames parquet
+rejects).
+"""
 from __future__ import annotations
 
-import json
+import hashlib
+import logging
 import os
+import shutil
+import tempfile
+from collections.abc import MutableMapping
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from queue import Queue
+from threading import Thread
+from typing import Iterator, List, Dict, Any, NamedTuple, Tuple
+
+import orjson
+import pandas as pd
+
+logger = logging.getLogger(__name__)
 
 SESSION_DIR = Path("saved_sessions")
 SESSION_DIR.mkdir(exist_ok=True)
@@ -14,28 +32,225 @@ FilesDict = Dict[str, Any]
 
 
 def _file_path(name: str) -> Path:
+    return SESSION_DIR / name / "chat.json"
+
+
+def _log_path(name: str) -> Path:
+    return SESSION_DIR / name / "chat.jsonl"
+
+
+def _blob_dir(name: str) -> Path:
+    return SESSION_DIR / name / "files"
+
+
+def _legacy_file_path(name: str) -> Path:
     return SESSION_DIR / f"{name}.json"
 
 
+class _BlobRef(NamedTuple):
+    session: str
+    blob: str
+
+
+class LazyFiles(MutableMapping):
+    """Files of a loaded session; each body is read from disk on first access."""
+
+    def __init__(self, refs: Dict[str, _BlobRef]):
+        self._data: Dict[str, Any] = dict(refs)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._data[key]
+        if isinstance(value, _BlobRef):
+            value = self._data[key] = _read_blob(value)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Shallow copy that leaves unread bodies as blob references."""
+        return dict(self._data)
+
+
+def _read_blob(ref: _BlobRef) -> Any:
+    path = _blob_dir(ref.session) / ref.blob
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    if path.suffix == ".csv":
+        return pd.read_csv(path)
+    return path.read_text(encoding="utf-8")
+
+
+# Saves run on one background thread so the UI never waits on disk; a single
+# FIFO worker keeps writes to the same session in call order.
+_save_queue: Queue = Queue()
+# What the writer last wrote successfully per session: (files key, messages).
+# Only the writer thread touches it.
+_written: Dict[str, Tuple[str | None, ChatHistory]] = {}
+
+
+def _save_worker() -> None:
+    while True:
+        fn, args = _save_queue.get()
+        try:
+            fn(*args)
+        except Exception:
+            # Keep the only writer alive; later saves must still go through
+            logger.exception("Saving session %r failed", args[0])
+        finally:
+            _save_queue.task_done()
+
+
+Thread(target=_save_worker, daemon=True).start()
+
+
 def save_session(name: str, chat_history: ChatHistory, files: FilesDict) -> None:
-    data = {
-        "chat_history": chat_history,
-        "files": {k: (v if isinstance(v, str) else "<dataframe>") for k, v in files.items()},
-    }
-    with open(_file_path(name), "w", encoding="utf-8") as fp:
-        json.dump(data, fp)
+    """Queue a full session save (rewrites the chat log); returns immediately."""
+    snapshot = files.snapshot() if isinstance(files, LazyFiles) else dict(files)
+    _save_queue.put((_do_save, (name, list(chat_history), snapshot)))
+
+
+def autosave_session(name: str, chat_history: ChatHistory, files: FilesDict, files_key: str) -> None:
+    """Queue an autosave that only appends new messages when it safely can.
+
+    The writer appends when its last successful write of ``name`` used the
+    same ``files_key`` and holds a prefix of ``chat_history``; otherwise
+    (first save, changed files, a failed write, or another tab saving the
+    same name in between) it does a full save.
+    """
+    snapshot = files.snapshot() if isinstance(files, LazyFiles) else dict(files)
+    _save_queue.put((_do_autosave, (name, list(chat_history), snapshot, files_key)))
+
+
+def append_turn(name: str, message: Dict[str, str]) -> None:
+    """Queue one chat message to be appended to an already saved session."""
+    _save_queue.put((_do_append, (name, dict(message))))
+
+
+def wait_for_saves() -> None:
+    """Block until all queued saves are on disk."""
+    _save_queue.join()
+
+
+def _do_autosave(name: str, chat_history: ChatHistory, files: FilesDict, files_key: str) -> None:
+    written = _written.get(name)
+    if written and written[0] == files_key and chat_history[:len(written[1])] == written[1]:
+        for message in chat_history[len(written[1]):]:
+            _do_append(name, message)
+    else:
+        _do_save(name, chat_history, files, files_key)
+
+
+def _do_save(
+    name: str, chat_history: ChatHistory, files: FilesDict, files_key: str | None = None
+) -> None:
+    _written.pop(name, None)  # re-recorded only if this save succeeds
+    blob_dir = _blob_dir(name)
+    blob_dir.mkdir(parents=True, exist_ok=True)
+    stored: Dict[str, str] = {}
+    for k, v in files.items():
+        if isinstance(v, _BlobRef):
+            # Unread body from a loaded session: reuse (or copy) the blob as is
+            if v.session != name and not (blob_dir / v.blob).exists():
+                shutil.copyfile(_blob_dir(v.session) / v.blob, blob_dir / v.blob)
+            stored[k] = v.blob
+        else:
+            try:
+                stored[k] = _write_blob(blob_dir, v)
+            except Exception:
+                # One unstorable file must not cost the chat log
+                logger.exception("Skipping file %r of session %r", k, name)
+    data = {"files": stored}
+    _atomic_write(_file_path(name), orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+    _atomic_write(_log_path(name), b"".join(orjson.dumps(m) + b"\n" for m in chat_history))
+    _written[name] = (files_key, chat_history)
+
+
+def _do_append(name: str, message: Dict[str, str]) -> None:
+    written = _written.pop(name, None)
+    with open(_log_path(name), "ab") as fp:
+        fp.write(orjson.dumps(message) + b"\n")
+    if written is not None:
+        _written[name] = (written[0], written[1] + [message])
+
+
+def _write_blob(blob_dir: Path, content: Any) -> str:
+    """Store content under its hash unless already present; return the blob name."""
+    if isinstance(content, str):
+        payload = content.encode("utf-8")
+        blob = f"{hashlib.blake2b(payload, digest_size=16).hexdigest()}.txt"
+        if not (blob_dir / blob).exists():
+            _atomic_write(blob_dir / blob, payload)
+        return blob
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(list(content.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(content, index=False).values.tobytes())
+    digest = h.hexdigest()
+    for blob in (f"{digest}.parquet", f"{digest}.csv"):
+        if (blob_dir / blob).exists():
+            return blob
+
+    fd, tmp = tempfile.mkstemp(dir=blob_dir, suffix=".tmp")
+    os.close(fd)
+    try:
+        content.to_parquet(tmp, index=False)
+        os.replace(tmp, blob_dir / f"{digest}.parquet")
+        return f"{digest}.parquet"
+    except Exception:
+        # e.g. a mixed-type object column from read_csv; CSV stores anything
+        logger.warning("Storing DataFrame %s as CSV: parquet write failed", digest, exc_info=True)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    blob = f"{digest}.csv"
+    _atomic_write(blob_dir / blob, content.to_csv(index=False).encode("utf-8"))
+    return blob
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
 
 
 def load_session(name: str) -> Tuple[ChatHistory, FilesDict]:
+    wait_for_saves()
     path = _file_path(name)
     if not path.exists():
-        return [], {}
-    with open(path, "r", encoding="utf-8") as fp:
-        data = json.load(fp)
-    # Note: DataFrames cannot be round‑tripped easily to JSON without extra work.
-    # Here we return strings for simplicity. Real app might use parquet for DataFrames.
-    return data.get("chat_history", []), data.get("files", {})
+        legacy = _legacy_file_path(name)
+        if not legacy.exists():
+            return [], {}
+        # Pre-directory format: file contents stored inline
+        data = orjson.loads(legacy.read_bytes())
+        return data.get("chat_history", []), data.get("files", {})
+    data = orjson.loads(path.read_bytes())
+    refs = {k: _BlobRef(name, blob) for k, blob in data.get("files", {}).items()}
+    log = _log_path(name)
+    if log.exists():
+        with open(log, "rb") as fp:
+            chat_history = [orjson.loads(line) for line in fp if line.strip()]
+    else:
+        chat_history = data.get("chat_history", [])
+    return chat_history, LazyFiles(refs)
 
 
 def list_sessions() -> List[str]:
-    return [p.stem for p in SESSION_DIR.glob("*.json")]
+    wait_for_saves()
+    names = [p.parent.name for p in SESSION_DIR.glob("*/chat.json")]
+    names += [p.stem for p in SESSION_DIR.glob("*.json") if p.stem not in names]
+    return names